@@ -2,18 +2,19 @@
 FastAPI web interface for Study Tools MCP
 """
 from fastapi import FastAPI, Request
-from fastapi.responses import HTMLResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager, AsyncExitStack
 import asyncio
-import json
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from openai import OpenAI
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+import httpx
+import orjson
 
 import sys
 import os
@@ -21,23 +22,54 @@ import boto3
 
 from src.study_tools_mcp.config import settings
 from src.study_tools_mcp.utils.logger import get_logger
+from src.study_tools_mcp.utils.memory import ConversationMemory, compact
+from src.study_tools_mcp.utils.response_cache import ResponseCache, context_digest
+from src.study_tools_mcp.utils.schema import clean_schema
+from src.study_tools_mcp.utils.session_store import create_session_store
 
 logger = get_logger(__name__)
 
 # Validate and create directories
 settings.create_directories()
 
-# Initialize OpenAI client
+# Initialize OpenAI client and response cache
 openai_client = None
+response_cache = None
 if settings.OPENAI_API_KEY:
-    openai_client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    # One pooled HTTP/2 client so concurrent chats multiplex over few connections
+    openai_client = AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=DefaultAsyncHttpxClient(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+            http2=True
+        )
+    )
+    response_cache = ResponseCache(openai_client, scope=settings.DEFAULT_MODEL)
 
 # MCP session
 mcp_session: Optional[ClientSession] = None
-mcp_tools = []
+mcp_tools: tuple[dict, ...] = ()
+
+# Study material listing, rebuilt only when the notes directory changes
+_files_cache: tuple[Optional[int], list[str]] = (None, [])
 
-# Conversation histories
-conversations = {}
+# Conversation histories (in-process, or Redis when REDIS_URL is set)
+session_store = create_session_store()
+
+
+def notes_signature() -> list[tuple[str, int, int]]:
+    """(name, mtime_ns, size) of every study material, for cache keys"""
+    try:
+        with os.scandir(settings.NOTES_PATH) as entries:
+            signature = [
+                (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+                for entry in entries
+                if entry.name.endswith(('.pdf', '.md'))
+            ]
+    except FileNotFoundError:
+        return []
+    signature.sort()
+    return signature
 
 
 def download_notes_from_s3() -> None:
@@ -55,9 +87,9 @@ def download_notes_from_s3() -> None:
         for key in keys:
             local_path = settings.NOTES_PATH / Path(key).name
             s3.download_file(settings.S3_BUCKET, key, str(local_path))
-        logger.info(f"Downloaded {len(keys)} study materials from S3")
+        logger.info("Downloaded %s study materials from S3", len(keys))
     except Exception as e:
-        logger.error(f"Failed to download from S3: {e}")
+        logger.error("Failed to download from S3: %s", e)
 
 
 @asynccontextmanager
@@ -98,22 +130,26 @@ async def lifespan(app: FastAPI):
 
             # Get available tools
             response = await mcp_session.list_tools()
-            mcp_tools = convert_mcp_tools(response.tools)
+            mcp_tools = tuple(convert_mcp_tools(response.tools))
 
             logger.info("Connected to MCP server")
         except Exception as e:
-            logger.error(f"Failed to connect to MCP server: {e}")
+            logger.error("Failed to connect to MCP server: %s", e)
 
         yield
 
-        # Shutdown handled by exit_stack
+        # Shutdown - MCP session handled by exit_stack
+        await session_store.close()
+        if openai_client:
+            await openai_client.close()
 
 
 app = FastAPI(
     title=settings.APP_NAME,
     description=settings.APP_DESCRIPTION,
     version=settings.APP_VERSION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -134,8 +170,7 @@ def convert_mcp_tools(tools):
     """Convert MCP tools to OpenAI function format"""
     openai_tools = []
     for tool in tools:
-        schema = tool.inputSchema.copy() if hasattr(tool.inputSchema, 'copy') else dict(tool.inputSchema)
-        schema.pop("title", None)
+        schema = clean_schema(tool.inputSchema)
 
         openai_tools.append({
             "type": "function",
@@ -148,73 +183,121 @@ def convert_mcp_tools(tools):
     return openai_tools
 
 
-async def process_with_tools(message: str, history: list) -> str:
-    """Process message with OpenAI and MCP tools"""
+async def stream_with_tools(message: str, history: ConversationMemory) -> AsyncIterator[str]:
+    """Process message with OpenAI and MCP tools, yielding the reply as it streams"""
     if not openai_client:
-        return "Error: OpenAI API key not configured"
+        yield "Error: OpenAI API key not configured"
+        return
 
-    # Add user message
+    # Add user message, folding old turns into the summary if over budget
     history.append({"role": "user", "content": message})
+    await compact(history, openai_client)
+
+    # Repeated or near-duplicate messages after the same history, with the
+    # same notes, skip both OpenAI calls; the history excludes the new message
+    context = context_digest(history.messages()[:-1], notes_signature())
+    cached, embedding = await response_cache.lookup(message, context)
+    if cached is not None:
+        history.append({"role": "assistant", "content": cached})
+        yield cached
+        return
 
-    # Call OpenAI
-    response = openai_client.chat.completions.create(
+    # Call OpenAI - text is forwarded as it arrives, tool calls are assembled
+    response = await openai_client.chat.completions.create(
         model=settings.DEFAULT_MODEL,
-        messages=history,
+        messages=history.messages(),
         tools=mcp_tools,
         tool_choice="auto",
-        temperature=settings.TEMPERATURE
+        temperature=settings.TEMPERATURE,
+        stream=True
     )
 
-    assistant_msg = response.choices[0].message
+    content_parts = []
+    tool_calls = {}
+    async for chunk in response:
+        if not chunk.choices:
+            continue
+        delta = chunk.choices[0].delta
+
+        if delta.content:
+            content_parts.append(delta.content)
+            yield delta.content
+
+        for tc in delta.tool_calls or []:
+            call = tool_calls.setdefault(tc.index, {
+                "id": "",
+                "type": "function",
+                "function": {"name": "", "arguments": ""}
+            })
+            if tc.id:
+                call["id"] = tc.id
+            if tc.function and tc.function.name:
+                call["function"]["name"] += tc.function.name
+            if tc.function and tc.function.arguments:
+                call["function"]["arguments"] += tc.function.arguments
 
     # Handle tool calls
-    if assistant_msg.tool_calls:
-        history.append({
+    if tool_calls:
+        calls = [tool_calls[index] for index in sorted(tool_calls)]
+        # Recorded only once every result is in, so a dropped stream never
+        # leaves tool calls without their results in the history
+        turn_messages = [{
             "role": "assistant",
-            "content": assistant_msg.content,
-            "tool_calls": [
-                {
-                    "id": tc.id,
-                    "type": tc.type,
-                    "function": {"name": tc.function.name, "arguments": tc.function.arguments}
-                }
-                for tc in assistant_msg.tool_calls
-            ]
-        })
-
-        # Execute tools
-        for tool_call in assistant_msg.tool_calls:
-            tool_name = tool_call.function.name
-            tool_args = json.loads(tool_call.function.arguments)
+            "content": "".join(content_parts) or None,
+            "tool_calls": calls
+        }]
+
+        # Execute tools concurrently; results come back in call order
+        results = await asyncio.gather(
+            *(
+                mcp_session.call_tool(
+                    tc["function"]["name"], orjson.loads(tc["function"]["arguments"] or "{}")
+                )
+                for tc in calls
+            ),
+            return_exceptions=True
+        )
 
-            try:
-                result = await mcp_session.call_tool(tool_name, tool_args)
+        for tool_call, result in zip(calls, results):
+            if isinstance(result, Exception):
+                tool_result = f"Error: {str(result)}"
+                logger.error("Tool call error: %s", result)
+            else:
                 tool_result = "".join(
                     content.text for content in result.content if hasattr(content, 'text')
                 )
-            except Exception as e:
-                tool_result = f"Error: {str(e)}"
-                logger.error(f"Tool call error: {e}")
 
-            history.append({
+            turn_messages.append({
                 "role": "tool",
-                "tool_call_id": tool_call.id,
+                "tool_call_id": tool_call["id"],
                 "content": tool_result
             })
 
-        # Get final response
-        final_response = openai_client.chat.completions.create(
+        for turn_message in turn_messages:
+            history.append(turn_message)
+
+        # Stream final response
+        final_response = await openai_client.chat.completions.create(
             model=settings.DEFAULT_MODEL,
-            messages=history,
-            temperature=settings.TEMPERATURE
+            messages=history.messages(),
+            temperature=settings.TEMPERATURE,
+            stream=True
         )
 
-        final_content = final_response.choices[0].message.content
-        history.append({"role": "assistant", "content": final_content})
-        return final_content
-    else:
-        history.append({"role": "assistant", "content": assistant_msg.content})
-        return assistant_msg.content
+        content_parts = []
+        async for chunk in final_response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                content_parts.append(chunk.choices[0].delta.content)
+                yield chunk.choices[0].delta.content
+
+    final_content = "".join(content_parts)
+    history.append({"role": "assistant", "content": final_content})
+    response_cache.store(message, final_content, embedding, context)
+
+
+def sse_event(text: str) -> str:
+    """Encode a text delta as a server-sent event"""
+    return f"data: {orjson.dumps(text).decode()}\n\n"
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -232,20 +315,27 @@ async def health_check():
 @app.get("/api/files")
 async def list_files():
     """List available study materials"""
-    if not settings.NOTES_PATH.exists():
+    global _files_cache
+
+    try:
+        mtime_ns = settings.NOTES_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
         return {"files": []}
 
-    files = [
-        file.name for file in settings.NOTES_PATH.iterdir()
-        if file.suffix in ['.pdf', '.md']
-    ]
-    return {"files": sorted(files)}
+    cached_mtime_ns, files = _files_cache
+    if mtime_ns != cached_mtime_ns:
+        with os.scandir(settings.NOTES_PATH) as entries:
+            files = [entry.name for entry in entries if entry.name.endswith(('.pdf', '.md'))]
+        files.sort()
+        _files_cache = (mtime_ns, files)
+
+    return {"files": files}
 
 
 @app.post("/api/chat")
 async def chat(request: Request):
     """Handle chat messages with streaming"""
-    data = await request.json()
+    data = orjson.loads(await request.body())
     message = data.get("message", "")
     session_id = data.get("session_id", "default")
 
@@ -253,28 +343,25 @@ async def chat(request: Request):
         return {"error": "Message is required"}
 
     # Get or create conversation history
-    if session_id not in conversations:
-        conversations[session_id] = []
+    history = await session_store.get(session_id)
 
     async def generate():
         try:
-            response = await process_with_tools(message, conversations[session_id])
+            has_response = False
+            async for delta in stream_with_tools(message, history):
+                has_response = True
+                yield sse_event(delta)
 
-            if not response:
-                yield f"data: Error: No response from server\n\n"
-                yield "data: [DONE]\n\n"
-                return
+            await session_store.save(session_id, history)
 
-            # Stream response
-            for line in response.split("\n"):
-                yield f"data: {line}\n\n"
-                await asyncio.sleep(0.02)
+            if not has_response:
+                yield sse_event("Error: No response from server")
 
             yield "data: [DONE]\n\n"
 
         except Exception as e:
-            logger.error(f"Chat error: {e}")
-            yield f"data: Error: {str(e)}\n\n"
+            logger.error("Chat error: %s", e)
+            yield sse_event(f"Error: {str(e)}")
             yield "data: [DONE]\n\n"
 
     return StreamingResponse(
@@ -283,6 +370,8 @@ async def chat(request: Request):
         headers={
             "Cache-Control": "no-cache",
             "Connection": "keep-alive",
+            # Stop nginx-style reverse proxies from buffering the stream
+            "X-Accel-Buffering": "no",
         }
     )
 
@@ -290,11 +379,10 @@ async def chat(request: Request):
 @app.post("/api/chat/clear")
 async def clear_conversation(request: Request):
     """Clear conversation history"""
-    data = await request.json()
+    data = orjson.loads(await request.body())
     session_id = data.get("session_id", "default")
 
-    if session_id in conversations:
-        conversations[session_id] = []
+    await session_store.clear(session_id)
 
     return {"status": "success"}
 
@@ -302,8 +390,8 @@ async def clear_conversation(request: Request):
 if __name__ == "__main__":
     import uvicorn
 
-    logger.info(f"Starting {settings.APP_NAME}...")
-    logger.info(f"Open your browser at: http://{settings.HOST}:{settings.PORT}")
+    logger.info("Starting %s...", settings.APP_NAME)
+    logger.info("Open your browser at: http://%s:%s", settings.HOST, settings.PORT)
 
     uvicorn.run(
         "app:app",
@@ -4,14 +4,17 @@ Simple script to run the MCP client with proper server connection.
 import asyncio
 import os
 import sys
-import json
+import orjson
 from typing import Optional
 from contextlib import AsyncExitStack
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+from study_tools_mcp.utils.memory import ConversationMemory, compact
+from study_tools_mcp.utils.schema import clean_schema
+
 # Load environment variables
 load_dotenv()
 
@@ -26,8 +29,8 @@ class MCPClient:
         if not openai_api_key:
             raise ValueError("OPENAI_API_KEY not found. Please add it to your .env file.")
 
-        self.openai_client = OpenAI(api_key=openai_api_key)
-        self.conversation_history = []
+        self.openai_client = AsyncOpenAI(api_key=openai_api_key)
+        self.conversation_history = ConversationMemory()
 
     async def connect_to_server(self):
         """Connect to the study-tools-mcp server."""
@@ -67,7 +70,7 @@ class MCPClient:
         openai_tools = []
         for tool in mcp_tools:
             # Clean the schema
-            parameters = self._clean_schema(tool.inputSchema)
+            parameters = clean_schema(tool.inputSchema)
 
             openai_tools.append({
                 "type": "function",
@@ -79,35 +82,19 @@ class MCPClient:
             })
         return openai_tools
 
-    def _clean_schema(self, schema):
-        """Remove 'title' fields from schema."""
-        if isinstance(schema, dict):
-            schema = schema.copy()
-            schema.pop("title", None)
-
-            if "properties" in schema and isinstance(schema["properties"], dict):
-                schema["properties"] = {
-                    key: self._clean_schema(value)
-                    for key, value in schema["properties"].items()
-                }
-
-            if "items" in schema:
-                schema["items"] = self._clean_schema(schema["items"])
-
-        return schema
-
     async def process_query(self, query: str) -> str:
         """Process user query with OpenAI and execute tool calls."""
-        # Add user message
+        # Add user message, folding old turns into the summary if over budget
         self.conversation_history.append({
             "role": "user",
             "content": query
         })
+        await compact(self.conversation_history, self.openai_client)
 
         # Call OpenAI
-        response = self.openai_client.chat.completions.create(
+        response = await self.openai_client.chat.completions.create(
             model="gpt-4o-mini",  # Use a real OpenAI model
-            messages=self.conversation_history,
+            messages=self.conversation_history.messages(),
             tools=self.tools,
             tool_choice="auto"
         )
@@ -133,28 +120,33 @@ class MCPClient:
                 ]
             })
 
-            # Execute each tool call
-            for tool_call in assistant_message.tool_calls:
-                tool_name = tool_call.function.name
-                tool_args = json.loads(tool_call.function.arguments)
+            # Execute all tool calls concurrently
+            tool_calls = assistant_message.tool_calls
+            all_args = [orjson.loads(tc.function.arguments) for tc in tool_calls]
 
-                print(f"\n🔧 Calling tool: {tool_name}")
+            for tool_call, tool_args in zip(tool_calls, all_args):
+                print(f"\n🔧 Calling tool: {tool_call.function.name}")
                 print(f"   Arguments: {tool_args}")
 
-                try:
-                    result = await self.session.call_tool(tool_name, tool_args)
+            results = await asyncio.gather(
+                *(
+                    self.session.call_tool(tc.function.name, tool_args)
+                    for tc, tool_args in zip(tool_calls, all_args)
+                ),
+                return_exceptions=True
+            )
 
+            # Results come back in call order
+            for tool_call, result in zip(tool_calls, results):
+                if isinstance(result, Exception):
+                    function_response = f"Error: {str(result)}"
+                    print(f"❌ Tool error: {result}\n")
+                else:
                     # Extract text content
-                    tool_result = ""
-                    for content in result.content:
-                        if hasattr(content, 'text'):
-                            tool_result += content.text
-
-                    function_response = tool_result
+                    function_response = "".join(
+                        content.text for content in result.content if hasattr(content, 'text')
+                    )
                     print(f"✅ Tool executed successfully\n")
-                except Exception as e:
-                    function_response = f"Error: {str(e)}"
-                    print(f"❌ Tool error: {e}\n")
 
                 # Add tool response to history
                 self.conversation_history.append({
@@ -164,9 +156,9 @@ class MCPClient:
                 })
 
             # Get final response from OpenAI
-            final_response = self.openai_client.chat.completions.create(
+            final_response = await self.openai_client.chat.completions.create(
                 model="gpt-4o-mini",
-                messages=self.conversation_history,
+                messages=self.conversation_history.messages(),
                 tools=self.tools,
                 tool_choice="auto"
             )
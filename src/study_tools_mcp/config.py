@@ -38,6 +38,11 @@ class Settings(BaseSettings):
     S3_BUCKET: Optional[str] = None
     AWS_REGION: str = "us-east-1"
 
+    # Sessions - set REDIS_URL to share sessions across workers
+    REDIS_URL: Optional[str] = None
+    SESSION_TTL: int = 3600
+    MAX_SESSIONS: int = 10_000
+
     # Model Settings
     USE_LOCAL_MODEL: bool = False
     LOCAL_MODEL_PATH: str = "./models/mistral-7b"
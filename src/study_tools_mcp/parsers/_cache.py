@@ -0,0 +1,129 @@
+"""Cache of parsed document text, keyed by file path, mtime and size."""
+
+import functools
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Relative like the notes path; config is not imported here because its
+# import-time secret lookup would run in every server and pool process
+CACHE_DIR = Path("./data/.cache")
+
+# Entries are cheap to rebuild, so favour speed over size
+COMPRESS_LEVEL = 1
+
+# Oldest entries are removed once the directory grows past this
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+PRUNE_EVERY = 64
+
+_writes = 0
+
+
+def _cache_file(key: str) -> Path:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+    return CACHE_DIR / f"{digest}.txt"
+
+
+def load_text(key: str) -> Optional[str]:
+    """Return the cached text stored under key, if any"""
+    cache_file = _cache_file(key)
+    try:
+        with gzip.open(cache_file, "rt", encoding="utf-8") as file:
+            text = file.read()
+        # Mark as recently used for prune()
+        os.utime(cache_file)
+        return text
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("Ignoring unreadable cache entry for %s: %s", key, e)
+        return None
+
+
+def store_text(key: str, text: str) -> None:
+    """Cache text under key, replacing any earlier entry"""
+    global _writes
+    tmp_file = None
+    try:
+        CACHE_DIR.mkdir(exist_ok=True, parents=True)
+        # Unique per writer: threads of one process may store the same key
+        fd, tmp_file = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as raw, \
+                gzip.open(raw, "wt", encoding="utf-8", compresslevel=COMPRESS_LEVEL) as file:
+            file.write(text)
+        # Atomic rename so concurrent readers never see a partial file
+        os.replace(tmp_file, _cache_file(key))
+    except Exception as e:
+        logger.warning("Could not write cache entry for %s: %s", key, e)
+        if tmp_file is not None:
+            Path(tmp_file).unlink(missing_ok=True)
+        return
+
+    _writes += 1
+    if _writes % PRUNE_EVERY == 0:
+        prune()
+
+
+def prune(max_bytes: int = MAX_CACHE_BYTES) -> None:
+    """Remove the least recently used entries until the cache fits max_bytes
+
+    Entries for old file versions and one-off topics are never read again,
+    so without this the cache directory only grows.
+    """
+    try:
+        entries = []
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith(".txt"):
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+    except FileNotFoundError:
+        return
+
+    total = sum(size for _, size, _ in entries)
+    if total <= max_bytes:
+        return
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    logger.info("Pruned %s cache entries", removed)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_or_parse(
+    path: str,
+    mtime_ns: int,
+    size: int,
+    parser_fn: Callable[..., str],
+    *args
+) -> str:
+    # The parser name keeps entries of different parsers of one file apart
+    key = ":".join(map(str, (parser_fn.__name__, path, mtime_ns, size, *args)))
+
+    text = load_text(key)
+    if text is None:
+        text = parser_fn(Path(path), *args)
+        store_text(key, text)
+
+    return text
+
+
+def get_or_parse(path: Path, parser_fn: Callable[..., str], *args) -> str:
+    """Return parser_fn(path, *args), reusing earlier results until the file changes"""
+    st = path.stat()
+    return _get_or_parse(str(path.resolve()), st.st_mtime_ns, st.st_size, parser_fn, *args)
@@ -2,12 +2,21 @@
 
 from pathlib import Path
 from typing import Optional
+import mmap
+import os
 import re
 
+import anyio
+
 from ..utils.logger import get_logger
+from ._cache import get_or_parse
 
 logger = get_logger(__name__)
 
+# MULTILINE so the same patterns work per line and with finditer over a whole file
+_HEADING_RE = re.compile(r'^(#{1,6})[ \t]+(.+)', re.MULTILINE)
+_H2_RE = re.compile(r'^##[ \t]+(.+)', re.MULTILINE)
+
 
 def extract_text_from_md(md_path: Path) -> str:
     """Extract text from Markdown file"""
@@ -15,52 +24,64 @@ def extract_text_from_md(md_path: Path) -> str:
         if not md_path.exists():
             raise FileNotFoundError(f"Markdown not found: {md_path}")
 
-        with open(md_path, 'r', encoding='utf-8') as file:
-            content = file.read()
-
-        logger.info(f"Extracted {len(content)} chars from {md_path.name}")
-        return content
+        return get_or_parse(md_path, _read_md)
 
     except Exception as e:
-        logger.error(f"Error reading Markdown {md_path.name}: {str(e)}")
+        logger.error("Error reading Markdown %s: %s", md_path.name, e)
         raise
 
 
+async def extract_text_from_md_async(md_path: Path) -> str:
+    """Extract text from Markdown file in a worker thread"""
+    return await anyio.to_thread.run_sync(extract_text_from_md, md_path)
+
+
+def _read_md(md_path: Path) -> str:
+    """Read the raw text of a Markdown file"""
+    with open(md_path, 'rb') as file:
+        # Decode straight from the mapped page cache; empty files cannot be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            content = ""
+        else:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = str(mm, 'utf-8')
+
+    # Same newlines as text-mode reading; CRLF notes would otherwise reach prompts
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+
+    logger.info("Extracted %s chars from %s", len(content), md_path.name)
+    return content
+
+
 def extract_section(md_path: Path, section_title: str) -> Optional[str]:
     """Extract a specific section from Markdown file"""
     try:
         content = extract_text_from_md(md_path)
-        lines = content.split('\n')
-        section_lines = []
-        in_section = False
+        section_title_lower = section_title.lower()
+        start = None
+        end = len(content)
         section_level = 0
 
-        for line in lines:
-            heading_match = re.match(r'^(#{1,6})\s+(.+)', line)
-
-            if heading_match:
-                level = len(heading_match.group(1))
-                title = heading_match.group(2).strip()
+        # Only headings are visited; the section is sliced out of the content
+        for heading_match in _HEADING_RE.finditer(content):
+            level = len(heading_match.group(1))
 
-                if section_title.lower() in title.lower() and not in_section:
-                    in_section = True
+            if start is None:
+                if section_title_lower in heading_match.group(2).strip().lower():
+                    start = heading_match.start()
                     section_level = level
-                    section_lines.append(line)
-                    continue
+            elif level <= section_level:
+                end = heading_match.start()
+                break
 
-                if in_section and level <= section_level:
-                    break
-
-            if in_section:
-                section_lines.append(line)
-
-        result = '\n'.join(section_lines) if section_lines else None
+        result = content[start:end].rstrip() if start is not None else None
         if result:
-            logger.info(f"Found section '{section_title}' in {md_path.name}")
+            logger.info("Found section '%s' in %s", section_title, md_path.name)
         return result
 
     except Exception as e:
-        logger.error(f"Error extracting section: {str(e)}")
+        logger.error("Error extracting section: %s", e)
         return None
 
 
@@ -68,13 +89,13 @@ def extract_all_sections(md_path: Path) -> dict[str, str]:
     """Extract all sections from Markdown file"""
     try:
         content = extract_text_from_md(md_path)
-        lines = content.split('\n')
+        lines = content.splitlines()
         sections = {}
         current_section = None
         current_content = []
 
         for line in lines:
-            heading_match = re.match(r'^##\s+(.+)', line)
+            heading_match = _H2_RE.match(line)
 
             if heading_match:
                 if current_section:
@@ -87,11 +108,11 @@ def extract_all_sections(md_path: Path) -> dict[str, str]:
         if current_section and current_content:
             sections[current_section] = '\n'.join(current_content).strip()
 
-        logger.info(f"Extracted {len(sections)} sections from {md_path.name}")
+        logger.info("Extracted %s sections from %s", len(sections), md_path.name)
         return sections
 
     except Exception as e:
-        logger.error(f"Error extracting sections: {str(e)}")
+        logger.error("Error extracting sections: %s", e)
         return {}
 
 
@@ -99,18 +120,14 @@ def get_headings(md_path: Path) -> list[tuple[int, str]]:
     """Extract all headings from Markdown file"""
     try:
         content = extract_text_from_md(md_path)
-        headings = []
-
-        for line in content.split('\n'):
-            match = re.match(r'^(#{1,6})\s+(.+)', line)
-            if match:
-                level = len(match.group(1))
-                title = match.group(2).strip()
-                headings.append((level, title))
+        headings = [
+            (len(match.group(1)), match.group(2).strip())
+            for match in _HEADING_RE.finditer(content)
+        ]
 
-        logger.info(f"Found {len(headings)} headings in {md_path.name}")
+        logger.info("Found %s headings in %s", len(headings), md_path.name)
         return headings
 
     except Exception as e:
-        logger.error(f"Error extracting headings: {str(e)}")
+        logger.error("Error extracting headings: %s", e)
         return []
@@ -3,38 +3,65 @@
 from pathlib import Path
 from typing import Optional
 
-import PyPDF2
+import pypdfium2 as pdfium
 
 from ..utils.logger import get_logger
+from ._cache import get_or_parse
 
 logger = get_logger(__name__)
 
 
-def extract_text_from_pdf(pdf_path: Path) -> str:
-    """Extract all text from PDF file"""
+def _is_heading(line: str) -> bool:
+    """Likely heading: an all-caps line of 6+ chars, or a short capitalized line"""
+    return (line.isupper() and len(line) > 5) or \
+        (line != "" and len(line) < 50 and line[0].isupper())
+
+
+def extract_text_from_pdf(pdf_path: Path, max_chars: Optional[int] = None) -> str:
+    """Extract all text from PDF file, or only the first max_chars characters"""
     try:
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-
-            for page in reader.pages:
-                try:
-                    text += page.extract_text() + "\n\n"
-                except Exception as e:
-                    logger.warning(f"Error on page: {str(e)}")
-                    continue
-
-        logger.info(f"Extracted {len(text)} chars from {pdf_path.name}")
-        return text.strip()
+        return get_or_parse(pdf_path, _parse_pdf, max_chars)
 
     except Exception as e:
-        logger.error(f"Error reading PDF {pdf_path.name}: {str(e)}")
+        logger.error("Error reading PDF %s: %s", pdf_path.name, e)
         raise
 
 
+def _parse_pdf(pdf_path: Path, max_chars: Optional[int] = None) -> str:
+    """Parse page text out of a PDF file, stopping once max_chars are collected"""
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        parts = []
+        num_chars = 0
+
+        for i, page in enumerate(pdf):
+            # Later pages would only be cut off again
+            if max_chars is not None and num_chars >= max_chars:
+                page.close()
+                break
+            try:
+                text_page = page.get_textpage()
+                parts.append(text_page.get_text_range())
+                num_chars += len(parts[-1]) + 2
+                text_page.close()
+            except Exception as e:
+                logger.warning("Error on page %s: %s", i + 1, e)
+                continue
+            finally:
+                page.close()
+    finally:
+        pdf.close()
+
+    text = "\n\n".join(parts).strip()
+    if max_chars is not None:
+        text = text[:max_chars]
+    logger.info("Extracted %s chars from %s", len(text), pdf_path.name)
+    return text
+
+
 def extract_section(pdf_path: Path, section_title: str) -> Optional[str]:
     """Extract a specific section from PDF"""
     try:
@@ -42,29 +69,29 @@ def extract_section(pdf_path: Path, section_title: str) -> Optional[str]:
         lines = full_text.split('\n')
         section_text = []
         in_section = False
+        section_title_lower = section_title.lower()
 
         for line in lines:
             line_stripped = line.strip()
 
-            if section_title.lower() in line_stripped.lower():
+            if section_title_lower in line_stripped.lower():
                 in_section = True
                 section_text.append(line)
                 continue
 
             if in_section:
                 # Stop at next heading
-                if (line_stripped.isupper() and len(line_stripped) > 5) or \
-                   (line_stripped and len(line_stripped) < 50 and line_stripped[0].isupper()):
+                if _is_heading(line_stripped):
                     break
                 section_text.append(line)
 
         result = '\n'.join(section_text) if section_text else None
         if result:
-            logger.info(f"Found section '{section_title}' in {pdf_path.name}")
+            logger.info("Found section '%s' in %s", section_title, pdf_path.name)
         return result
 
     except Exception as e:
-        logger.error(f"Error extracting section: {str(e)}")
+        logger.error("Error extracting section: %s", e)
         return None
 
 
@@ -74,19 +101,21 @@ def get_pdf_metadata(pdf_path: Path) -> dict:
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
 
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            metadata = reader.metadata or {}
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            metadata = pdf.get_metadata_dict()
 
             result = {
-                'title': metadata.get('/Title', 'Unknown'),
-                'author': metadata.get('/Author', 'Unknown'),
-                'pages': len(reader.pages),
+                'title': metadata.get('Title') or 'Unknown',
+                'author': metadata.get('Author') or 'Unknown',
+                'pages': len(pdf),
             }
+        finally:
+            pdf.close()
 
-            logger.info(f"Metadata from {pdf_path.name}: {result['pages']} pages")
-            return result
+        logger.info("Metadata from %s: %s pages", pdf_path.name, result['pages'])
+        return result
 
     except Exception as e:
-        logger.error(f"Error getting PDF metadata: {str(e)}")
+        logger.error("Error getting PDF metadata: %s", e)
         raise
@@ -2,27 +2,40 @@
 MCP Server for Study Tools
 """
 
-from typing import Literal
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal
 from pathlib import Path
 from mcp.server.fastmcp import FastMCP
 
 from .utils.logger import get_logger
-from .tools.summarizer import summarize_section, summarize_chapter, find_topic_content
+from .tools.summarizer import summarize_section, summarize_chapter, find_topic_content, warmup
 from .tools.quiz_gen import generate_quiz
 from .tools.explainer import explain_concept, compare_concepts
 from .tools.flashcards import create_flashcard_deck
 
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Warm the PDF cache in the background while the server handles requests"""
+    warm_task = asyncio.create_task(warmup())
+    try:
+        yield
+    finally:
+        warm_task.cancel()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("study-tools-mcp")
+mcp = FastMCP("study-tools-mcp", lifespan=lifespan)
 
 # Default notes path
 NOTES_PATH = Path("./data/notes")
 
 logger.info("=" * 60)
 logger.info("Study Tools MCP Server Initializing")
-logger.info(f"Notes path: {NOTES_PATH}")
+logger.info("Notes path: %s", NOTES_PATH)
 logger.info("Running via Claude Desktop MCP")
 logger.info("=" * 60)
 
@@ -85,7 +98,7 @@ def main():
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
     except Exception as e:
-        logger.error(f"Fatal error: {str(e)}")
+        logger.error("Fatal error: %s", e)
         raise
 
 
@@ -1,11 +1,52 @@
 """Concept explanation tools."""
 
+import asyncio
 from typing import Literal
 from ..utils.logger import get_logger
 from .summarizer import find_topic_content
 
 logger = get_logger(__name__)
 
+_LEVEL_GUIDANCE = {
+    "beginner": "Use simple analogies, avoid jargon, focus on intuition.",
+    "intermediate": "Include technical terms with definitions, explain how things work.",
+    "advanced": "Include formulas, edge cases, implementation details, and tradeoffs."
+}
+
+# Prompt skeletons; the study content goes between prefix and suffix
+_EXPLAIN_PREFIX = """# Explanation Request: {term}
+
+**Difficulty Level:** {level}
+- {guidance}
+
+**Structure to follow:**
+1. Simple definition
+2. Detailed explanation
+3. Example or analogy
+4. Common misconceptions
+5. Related concepts
+
+{content_note}
+
+"""
+
+_EXPLAIN_SUFFIX = """
+
+Please provide a comprehensive explanation now."""
+
+_COMPARE_PREFIX = """# Comparison Request: {concept1} vs {concept2}
+
+**Instructions:** Compare and contrast these two concepts.
+
+**Structure to follow:**
+1. Brief overview of each concept
+2. Similarities
+3. Key differences
+4. When to use each
+5. Relationship between them
+
+"""
+
 
 async def explain_concept(
     term: str,
@@ -16,39 +57,26 @@ async def explain_concept(
     Returns instructions for Claude Desktop to explain the concept.
     """
     try:
-        logger.info(f"Preparing explanation request for '{term}' at {level} level")
+        logger.info("Preparing explanation request for '%s' at %s level", term, level)
 
         content = await find_topic_content(term)
 
-        level_map = {
-            "beginner": "Use simple analogies, avoid jargon, focus on intuition.",
-            "intermediate": "Include technical terms with definitions, explain how things work.",
-            "advanced": "Include formulas, edge cases, implementation details, and tradeoffs."
-        }
-
-        has_content = "No content found" not in content and "Error" not in content and "Not found" not in content
+        if content.ok:
+            content_note = "**Content from study materials:**"
+        else:
+            content_note = "**Note:** No specific study materials found. Use general knowledge."
 
         # Return instructions for Claude Desktop to process
-        return f"""# Explanation Request: {term.replace('_', ' ').title()}
-
-**Difficulty Level:** {level}
-- {level_map[level]}
-
-**Structure to follow:**
-1. Simple definition
-2. Detailed explanation
-3. Example or analogy
-4. Common misconceptions
-5. Related concepts
-
-{"**Content from study materials:**" if has_content else "**Note:** No specific study materials found. Use general knowledge."}
-
-{content if has_content else ""}
-
-Please provide a comprehensive explanation now."""
+        prefix = _EXPLAIN_PREFIX.format(
+            term=term.replace('_', ' ').title(),
+            level=level,
+            guidance=_LEVEL_GUIDANCE[level],
+            content_note=content_note
+        )
+        return prefix + content.text + _EXPLAIN_SUFFIX
 
     except Exception as e:
-        logger.error(f"Error preparing explanation: {str(e)}")
+        logger.error("Error preparing explanation: %s", e)
         return f"Error: Failed to prepare explanation: {str(e)}"
 
 
@@ -58,35 +86,24 @@ async def compare_concepts(concept1: str, concept2: str) -> str:
     Returns instructions for Claude Desktop to compare the concepts.
     """
     try:
-        logger.info(f"Preparing comparison request for '{concept1}' vs '{concept2}'")
+        logger.info("Preparing comparison request for '%s' vs '%s'", concept1, concept2)
 
-        content1 = await find_topic_content(concept1)
-        content2 = await find_topic_content(concept2)
-
-        has_content1 = "No content found" not in content1 and "Error" not in content1 and "Not found" not in content1
-        has_content2 = "No content found" not in content2 and "Error" not in content2 and "Not found" not in content2
+        # Independent lookups, so run them concurrently
+        content1, content2 = await asyncio.gather(
+            find_topic_content(concept1),
+            find_topic_content(concept2)
+        )
 
         # Return instructions for Claude Desktop to process
-        result = f"""# Comparison Request: {concept1.title()} vs {concept2.title()}
-
-**Instructions:** Compare and contrast these two concepts.
-
-**Structure to follow:**
-1. Brief overview of each concept
-2. Similarities
-3. Key differences
-4. When to use each
-5. Relationship between them
-
-"""
+        result = _COMPARE_PREFIX.format(concept1=concept1.title(), concept2=concept2.title())
 
-        if has_content1:
-            result += f"**Content for {concept1}:**\n\n{content1}\n\n---\n\n"
+        if content1.ok:
+            result += f"**Content for {concept1}:**\n\n{content1.text}\n\n---\n\n"
         else:
             result += f"**Note:** No study materials found for {concept1}. Use general knowledge.\n\n"
 
-        if has_content2:
-            result += f"**Content for {concept2}:**\n\n{content2}\n\n---\n\n"
+        if content2.ok:
+            result += f"**Content for {concept2}:**\n\n{content2.text}\n\n---\n\n"
         else:
             result += f"**Note:** No study materials found for {concept2}. Use general knowledge.\n\n"
 
@@ -95,7 +112,7 @@ async def compare_concepts(concept1: str, concept2: str) -> str:
         return result
 
     except Exception as e:
-        logger.error(f"Error preparing comparison: {str(e)}")
+        logger.error("Error preparing comparison: %s", e)
         return f"Error: Failed to prepare comparison: {str(e)}"
 
 
@@ -5,43 +5,49 @@ from .summarizer import find_topic_content
 
 logger = get_logger(__name__)
 
-
-async def create_flashcard_deck(topic: str, num_cards: int = 10) -> str:
-    """Generate flashcards for a topic
-
-    Returns instructions for Claude Desktop to generate flashcards.
-    """
-    try:
-        logger.info(f"Preparing flashcard request for '{topic}': {num_cards} cards")
-
-        content = await find_topic_content(topic)
-        if "No content found" in content or "Error" in content or "Not found" in content:
-            return content
-
-        # Return instructions for the LLM to process.
-        # Output MUST be valid JSON matching the schema below — no prose, no markdown fences.
-        return f"""Create {num_cards} flashcards for studying "{topic.replace('_', ' ')}".
+# Prompt skeleton; the study content goes between prefix and suffix.
+# Output MUST be valid JSON matching the schema below — no prose, no markdown fences.
+_FLASHCARD_PREFIX = """Create {num_cards} flashcards for studying "{topic}".
 
 Each flashcard needs a clear question/prompt on the front and a concise answer on the back.
 Cover key concepts, definitions, formulas, and important facts.
 
 Base your flashcards on the following content:
 
-{content}
+"""
+
+_FLASHCARD_SUFFIX = """
 
 Return ONLY a valid JSON object (no markdown code fences, no extra text) with this exact schema:
-{{
+{
   "type": "flashcards",
   "cards": [
-    {{
+    {
       "front": "question or prompt",
       "back": "answer or explanation"
-    }}
+    }
   ]
-}}"""
+}"""
+
+
+async def create_flashcard_deck(topic: str, num_cards: int = 10) -> str:
+    """Generate flashcards for a topic
+
+    Returns instructions for Claude Desktop to generate flashcards.
+    """
+    try:
+        logger.info("Preparing flashcard request for '%s': %s cards", topic, num_cards)
+
+        content = await find_topic_content(topic)
+        if not content.ok:
+            return content.reason
+
+        # Return instructions for the LLM to process.
+        prefix = _FLASHCARD_PREFIX.format(num_cards=num_cards, topic=topic.replace('_', ' '))
+        return prefix + content.text + _FLASHCARD_SUFFIX
 
     except Exception as e:
-        logger.error(f"Error preparing flashcards: {str(e)}")
+        logger.error("Error preparing flashcards: %s", e)
         return f"Error: Failed to prepare flashcards: {str(e)}"
 
 
@@ -6,6 +6,37 @@ from .summarizer import find_topic_content
 
 logger = get_logger(__name__)
 
+_DIFFICULTY_GUIDANCE = {
+    "beginner": "Focus on basic definitions and concepts.",
+    "intermediate": "Include application-based questions.",
+    "advanced": "Include complex scenarios and edge cases."
+}
+
+# Prompt skeleton; the study content goes between prefix and suffix.
+# Output MUST be valid JSON matching the schema below — no prose, no markdown fences.
+_QUIZ_PREFIX = """Create a {num_questions}-question multiple-choice quiz on "{topic}".
+
+Difficulty: {difficulty} — {guidance}
+
+Base your questions on the following content:
+
+"""
+
+_QUIZ_SUFFIX = """
+
+Return ONLY a valid JSON object (no markdown code fences, no extra text) with this exact schema:
+{
+  "type": "quiz",
+  "questions": [
+    {
+      "question": "question text",
+      "options": {"A": "...", "B": "...", "C": "...", "D": "..."},
+      "answer": "A",
+      "explanation": "why this answer is correct"
+    }
+  ]
+}"""
+
 
 async def generate_quiz(
     topic: str,
@@ -17,43 +48,23 @@ async def generate_quiz(
     Returns instructions for Claude Desktop to generate the quiz.
     """
     try:
-        logger.info(f"Preparing quiz request for '{topic}': {num_questions} questions, {difficulty}")
+        logger.info("Preparing quiz request for '%s': %s questions, %s", topic, num_questions, difficulty)
 
         content = await find_topic_content(topic)
-        if "No content found" in content or "Error" in content or "Not found" in content:
-            return content
-
-        difficulty_map = {
-            "beginner": "Focus on basic definitions and concepts.",
-            "intermediate": "Include application-based questions.",
-            "advanced": "Include complex scenarios and edge cases."
-        }
+        if not content.ok:
+            return content.reason
 
         # Return instructions for the LLM to process.
-        # Output MUST be valid JSON matching the schema below — no prose, no markdown fences.
-        return f"""Create a {num_questions}-question multiple-choice quiz on "{topic}".
-
-Difficulty: {difficulty} — {difficulty_map[difficulty]}
-
-Base your questions on the following content:
-
-{content}
-
-Return ONLY a valid JSON object (no markdown code fences, no extra text) with this exact schema:
-{{
-  "type": "quiz",
-  "questions": [
-    {{
-      "question": "question text",
-      "options": {{"A": "...", "B": "...", "C": "...", "D": "..."}},
-      "answer": "A",
-      "explanation": "why this answer is correct"
-    }}
-  ]
-}}"""
+        prefix = _QUIZ_PREFIX.format(
+            num_questions=num_questions,
+            topic=topic,
+            difficulty=difficulty,
+            guidance=_DIFFICULTY_GUIDANCE[difficulty]
+        )
+        return prefix + content.text + _QUIZ_SUFFIX
 
     except Exception as e:
-        logger.error(f"Error preparing quiz: {str(e)}")
+        logger.error("Error preparing quiz: %s", e)
         return f"Error: Failed to prepare quiz: {str(e)}"
 
 
@@ -1,73 +1,378 @@
 """Summarization tools for study materials."""
 
+import asyncio
+import functools
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
+
+import orjson
+from cachetools import LRUCache
 
 from ..utils.logger import get_logger
+from ..parsers._cache import load_text, store_text
 from ..parsers.pdf_parser import extract_text_from_pdf, extract_section
+from ..parsers.md_parser import extract_text_from_md_async
+from .topic_index import TopicIndex, file_tokens
 
 logger = get_logger(__name__)
 
 # Default notes path - can be overridden
 NOTES_PATH = Path("./data/notes")
 
+# Characters of a PDF used when no matching section is found
+MAX_PDF_CHARS = 10000
+
+
+@dataclass
+class ContentResult:
+    """Outcome of a topic search: the study material text, or why there is none"""
+    ok: bool
+    text: str = ""
+    reason: str = ""
+
+
+# PDF parsing is CPU-bound, so files are parsed in parallel worker processes.
+# Spawned rather than forked: the server process runs threads, and forking
+# while one of them holds a lock can deadlock the child.
+def _new_pdf_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+_PDF_POOL = _new_pdf_pool()
+
+
+def _lower_priority() -> None:
+    """Worker initializer: yield the CPU to interactive queries"""
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+# Per-file extraction results and whole find_topic_content results. Keys
+# include each file's mtime and size, so edited files are re-extracted.
+_MEM_CACHE: LRUCache = LRUCache(maxsize=256)
+_QUERY_CACHE: LRUCache = LRUCache(maxsize=64)
+
+# Which files mention which words, so a query only extracts relevant files.
+# Loaded on first use: pool workers import this module but never query it.
+_TOPIC_INDEX: Optional[TopicIndex] = None
+
+# (resolved path, mtime_ns, size) -> task parsing that file for the index
+_INDEXING: dict[tuple[str, int, int], asyncio.Future] = {}
+
+# Notes directory listing, re-globbed only when the directory mtime changes
+_DIR_CACHE = {"mtime": None, "pdfs": [], "mds": []}
+
+
+def _topic_index() -> TopicIndex:
+    global _TOPIC_INDEX
+    if _TOPIC_INDEX is None:
+        _TOPIC_INDEX = TopicIndex()
+    return _TOPIC_INDEX
+
+
+def _list_notes() -> tuple[list[Path], list[Path]]:
+    """PDF and Markdown files in the notes directory"""
+    mtime_ns = NOTES_PATH.stat().st_mtime_ns
+    if _DIR_CACHE["mtime"] != mtime_ns:
+        _DIR_CACHE["pdfs"] = list(NOTES_PATH.glob("*.pdf"))
+        _DIR_CACHE["mds"] = list(NOTES_PATH.glob("*.md"))
+        _DIR_CACHE["mtime"] = mtime_ns
+    return list(_DIR_CACHE["pdfs"]), list(_DIR_CACHE["mds"])
+
+
+def _extraction_key(pdf_file: Path, topic: Optional[str]) -> str:
+    st = pdf_file.stat()
+    return f"{pdf_file.resolve()}|{st.st_mtime_ns}|{st.st_size}|{(topic or '').lower()}"
 
-async def find_topic_content(topic: str) -> str:
+
+def _query_key(files: list[Path], topic: str) -> str:
+    signature = []
+    for file in files:
+        st = file.stat()
+        signature.append((str(file.resolve()), st.st_mtime_ns, st.st_size))
+    signature.sort()
+    digest = hashlib.blake2b(repr(signature).encode("utf-8"), digest_size=16).hexdigest()
+    return f"query|{digest}|{topic.lower()}"
+
+
+def _cached_extraction(fn):
+    """Memoize extraction results in memory and on disk"""
+    @functools.wraps(fn)
+    def wrapper(pdf_file: Path, topic: Optional[str]) -> tuple[str, str]:
+        key = _extraction_key(pdf_file, topic)
+        result = _MEM_CACHE.get(key)
+        if result is not None:
+            return result
+
+        cached = load_text(key)
+        if cached is not None:
+            result = tuple(orjson.loads(cached))
+        else:
+            result = fn(pdf_file, topic)
+            store_text(key, orjson.dumps(result).decode())
+
+        _MEM_CACHE[key] = result
+        return result
+
+    return wrapper
+
+
+@_cached_extraction
+def _extract_one(pdf_file: Path, topic: Optional[str]) -> tuple[str, str]:
+    """Extract (heading, text) for a topic from one PDF
+
+    Runs in a worker process, so it must stay a top-level function.
+    """
+    logger.info("Processing PDF: %s", pdf_file.name)
+
+    # Try to extract specific section first
+    if topic:
+        section_content = extract_section(pdf_file, topic)
+        if section_content:
+            return f"{pdf_file.name} - Section: {topic}", section_content
+
+    # If no specific section, use the start of the document, limited to
+    # avoid overwhelming context. A section search has already parsed and
+    # cached the full text, so slice that; otherwise stop parsing early.
+    if topic:
+        text = extract_text_from_pdf(pdf_file)
+        truncated = len(text) > MAX_PDF_CHARS
+        text = text[:MAX_PDF_CHARS]
+    else:
+        text = extract_text_from_pdf(pdf_file, max_chars=MAX_PDF_CHARS)
+        truncated = len(text) >= MAX_PDF_CHARS
+    if truncated:
+        text += "\n\n[Content truncated...]"
+    return pdf_file.name, text
+
+
+async def _run_in_pool(fn, *args, executor: Optional[ProcessPoolExecutor] = None):
+    """Run fn(*args) in a worker process
+
+    Without an explicit executor the shared PDF pool is used. If a worker
+    died (a crash on a malformed PDF, an OOM kill), the pool is broken for
+    good, so it is replaced and the call retried once.
+    """
+    global _PDF_POOL
+    loop = asyncio.get_running_loop()
+    if executor is not None:
+        return await loop.run_in_executor(executor, fn, *args)
+
+    for attempt in range(2):
+        pool = _PDF_POOL
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            if attempt:
+                raise
+            # Concurrent callers see the same broken pool; replace it once
+            if pool is _PDF_POOL:
+                logger.warning("PDF worker pool broke, starting a new one")
+                pool.shutdown(wait=False, cancel_futures=True)
+                _PDF_POOL = _new_pdf_pool()
+
+
+async def _refresh_index(files: list[Path], executor: Optional[ProcessPoolExecutor] = None) -> bool:
+    """Re-index new or changed files in the process pool
+
+    Returns False if any file could not be indexed.
+    """
+    stale = _topic_index().stale(files)
+
+    # Join a parse already running for the same file (warmup, or the other
+    # lookup of compare_concepts) instead of starting a second one
+    tasks = []
+    for file in stale:
+        st = file.stat()
+        key = (str(file.resolve()), st.st_mtime_ns, st.st_size)
+        task = _INDEXING.get(key)
+        if task is None:
+            task = asyncio.ensure_future(_run_in_pool(file_tokens, file, executor=executor))
+            _INDEXING[key] = task
+            task.add_done_callback(lambda _, key=key: _INDEXING.pop(key, None))
+        tasks.append(task)
+
+    # Shielded so a cancelled caller does not cancel a parse others await
+    results = await asyncio.gather(
+        *(asyncio.shield(task) for task in tasks),
+        return_exceptions=True
+    )
+
+    tokens = {}
+    for file, result in zip(stale, results):
+        if isinstance(result, BaseException):
+            logger.error("Error indexing %s: %s", file.name, result)
+            continue
+        tokens[file] = result
+
+    _topic_index().update(files, tokens)
+    return len(tokens) == len(stale)
+
+
+async def warmup() -> None:
+    """Index the notes ahead of the first query
+
+    Indexing parses the full text of every new or changed file into the
+    parse cache, which section searches then read. Work runs in a small
+    pool of low-priority workers so that queries arriving meanwhile are
+    not starved; each web worker starts its own server, so the pool is
+    kept to two processes.
+    """
+    if not NOTES_PATH.exists():
+        return
+
+    pool = ProcessPoolExecutor(
+        max_workers=min(2, os.cpu_count() or 1),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_lower_priority
+    )
+    try:
+        pdf_files, md_files = _list_notes()
+        await _refresh_index(pdf_files + md_files, executor=pool)
+        logger.info("Warmed parse cache for %s file(s)", len(pdf_files) + len(md_files))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+async def find_topic_content(topic: str) -> ContentResult:
     """Find content related to a topic in notes directory"""
     try:
         if not NOTES_PATH.exists():
-            return f"Notes directory not found: {NOTES_PATH}. Please create it and add your study materials."
+            return ContentResult(
+                ok=False,
+                reason=f"Notes directory not found: {NOTES_PATH}. Please create it and add your study materials."
+            )
 
-        logger.info(f"Searching for topic '{topic}'")
+        logger.info("Searching for topic '%s'", topic)
 
         # List all files in notes directory
-        pdf_files = list(NOTES_PATH.glob("*.pdf"))
-        md_files = list(NOTES_PATH.glob("*.md"))
+        pdf_files, md_files = _list_notes()
 
         if not pdf_files and not md_files:
-            return f"No PDF or Markdown files found in {NOTES_PATH}. Please add your study materials."
-
-        # Extract content from PDFs
+            return ContentResult(
+                ok=False,
+                reason=f"No PDF or Markdown files found in {NOTES_PATH}. Please add your study materials."
+            )
+
+        # Same files, unchanged, same topic: reuse the whole result
+        query_key = _query_key(pdf_files + md_files, topic)
+        combined_content = _QUERY_CACHE.get(query_key)
+        if combined_content is None:
+            combined_content = await asyncio.to_thread(load_text, query_key)
+        if combined_content is not None:
+            _QUERY_CACHE[query_key] = combined_content
+            logger.info("Using cached content for topic '%s'", topic)
+            return ContentResult(ok=True, text=combined_content)
+
+        # Narrow down to files that mention the topic
+        indexed = await _refresh_index(pdf_files + md_files)
+        candidates = _topic_index().lookup(topic)
+        if candidates is not None:
+            pdf_files = [file for file in pdf_files if str(file.resolve()) in candidates]
+            md_files = [file for file in md_files if str(file.resolve()) in candidates]
+            logger.info("Topic index matched %s file(s)", len(pdf_files) + len(md_files))
+
+        # Only PDFs missing from the in-memory cache go to the process pool
+        pdf_keys = [_extraction_key(pdf_file, topic) for pdf_file in pdf_files]
+        pdf_results = [_MEM_CACHE.get(key) for key in pdf_keys]
+        pending = [i for i, result in enumerate(pdf_results) if result is None]
+
+        # Parse PDFs across the process pool and read markdown in threads, all at once
+        results = await asyncio.gather(
+            *(_run_in_pool(_extract_one, pdf_files[i], topic) for i in pending),
+            *(extract_text_from_md_async(md_file) for md_file in md_files),
+            return_exceptions=True
+        )
+        for i, result in zip(pending, results):
+            pdf_results[i] = result
+            if not isinstance(result, Exception):
+                _MEM_CACHE[pdf_keys[i]] = result
+        md_results = results[len(pending):]
+
+        # (heading, text) per file
         all_content = []
 
-        for pdf_file in pdf_files:
-            try:
-                logger.info(f"Processing PDF: {pdf_file.name}")
-                # Try to extract specific section first
-                section_content = extract_section(pdf_file, topic)
-                if section_content:
-                    all_content.append(f"## From {pdf_file.name} - Section: {topic}\n\n{section_content}")
-                else:
-                    # If no specific section, extract full content
-                    full_text = extract_text_from_pdf(pdf_file)
-                    # Limit content to avoid overwhelming context
-                    if len(full_text) > 10000:
-                        full_text = full_text[:10000] + "\n\n[Content truncated...]"
-                    all_content.append(f"## From {pdf_file.name}\n\n{full_text}")
-            except Exception as e:
-                logger.error(f"Error processing {pdf_file.name}: {str(e)}")
+        for pdf_file, result in zip(pdf_files, pdf_results):
+            if isinstance(result, Exception):
+                logger.error("Error processing %s: %s", pdf_file.name, result)
                 continue
+            all_content.append(result)
 
-        # Process markdown files
-        for md_file in md_files:
-            try:
-                content = md_file.read_text(encoding='utf-8')
-                all_content.append(f"## From {md_file.name}\n\n{content}")
-            except Exception as e:
-                logger.error(f"Error reading {md_file.name}: {str(e)}")
+        for md_file, result in zip(md_files, md_results):
+            if isinstance(result, Exception):
+                logger.error("Error reading %s: %s", md_file.name, result)
                 continue
+            all_content.append((md_file.name, result))
 
         if not all_content:
-            return f"Could not extract content from files in {NOTES_PATH}. Please check the files are readable."
+            return ContentResult(
+                ok=False,
+                reason=f"Could not extract content from files in {NOTES_PATH}. Please check the files are readable."
+            )
+
+        # Flat list of parts joined once, so each file's text is copied only once
+        parts = []
+        for heading, text in all_content:
+            if parts:
+                parts.append("\n\n---\n\n")
+            parts.extend(("## From ", heading, "\n\n", text))
+        combined_content = "".join(parts)
+        logger.info("Extracted %s characters from %s file(s)", len(combined_content), len(all_content))
+
+        # A file that failed would stay missing until the notes change, so
+        # only complete results are cached
+        if indexed and len(all_content) == len(pdf_files) + len(md_files):
+            _QUERY_CACHE[query_key] = combined_content
+            await asyncio.to_thread(store_text, query_key, combined_content)
+
+        return ContentResult(ok=True, text=combined_content)
 
-        combined_content = "\n\n---\n\n".join(all_content)
-        logger.info(f"Extracted {len(combined_content)} characters from {len(all_content)} file(s)")
+    except Exception as e:
+        logger.error("Error searching for topic: %s", e)
+        return ContentResult(ok=False, reason=f"Error searching for topic: {str(e)}")
 
-        return combined_content
 
-    except Exception as e:
-        logger.error(f"Error searching for topic: {str(e)}")
-        return f"Error searching for topic: {str(e)}"
+_LENGTH_INSTRUCTIONS = {
+    "brief": "Create a concise 3-5 sentence summary highlighting the key points.",
+    "detailed": "Create a comprehensive summary covering all main concepts, with 2-3 paragraphs.",
+    "comprehensive": "Create an extensive summary that covers all details, examples, and nuances."
+}
+
+# Prompt skeletons; the study content goes between prefix and suffix
+_SUMMARY_PREFIX = """# Summarization Request for: {topic}
+
+**Instructions:** {instructions}
+
+**Content to summarize:**
+
+"""
+
+_SUMMARY_SUFFIX = """
+
+Please provide a well-structured summary with key concepts, formulas, and practical insights."""
+
+_CHAPTER_PREFIX = """# Chapter Summary Request: {chapter}
+
+**Instructions:** Create a comprehensive chapter summary with the following structure:
+
+1. Overview (2-3 sentences)
+2. Key Concepts (bullet points)
+3. Important Formulas/Algorithms
+4. Practical Applications
+5. Common Pitfalls
+
+**Content to summarize:**
+
+"""
 
 
 async def summarize_section(
@@ -79,31 +384,21 @@ async def summarize_section(
     Returns the content for Claude Desktop to summarize.
     """
     try:
-        logger.info(f"Preparing content for summarizing '{topic}' ({length})")
+        logger.info("Preparing content for summarizing '%s' (%s)", topic, length)
 
         content = await find_topic_content(topic)
-        if "No content found" in content or "Error" in content or "Not found" in content:
-            return content
-
-        length_instructions = {
-            "brief": "Create a concise 3-5 sentence summary highlighting the key points.",
-            "detailed": "Create a comprehensive summary covering all main concepts, with 2-3 paragraphs.",
-            "comprehensive": "Create an extensive summary that covers all details, examples, and nuances."
-        }
+        if not content.ok:
+            return content.reason
 
         # Return instructions for Claude Desktop to process
-        return f"""# Summarization Request for: {topic.replace('_', ' ').title()}
-
-**Instructions:** {length_instructions[length]}
-
-**Content to summarize:**
-
-{content}
-
-Please provide a well-structured summary with key concepts, formulas, and practical insights."""
+        prefix = _SUMMARY_PREFIX.format(
+            topic=topic.replace('_', ' ').title(),
+            instructions=_LENGTH_INSTRUCTIONS[length]
+        )
+        return prefix + content.text + _SUMMARY_SUFFIX
 
     except Exception as e:
-        logger.error(f"Error preparing summary for '{topic}': {str(e)}")
+        logger.error("Error preparing summary for '%s': %s", topic, e)
         return f"Error: Failed to prepare summary: {str(e)}"
 
 
@@ -114,24 +409,12 @@ async def summarize_chapter(chapter_name: str) -> str:
     """
     try:
         content = await find_topic_content(chapter_name)
-        if "No content found" in content or "Error" in content or "Not found" in content:
-            return content
+        if not content.ok:
+            return content.reason
 
         # Return instructions for Claude Desktop to process
-        return f"""# Chapter Summary Request: {chapter_name.replace('_', ' ').title()}
-
-**Instructions:** Create a comprehensive chapter summary with the following structure:
-
-1. Overview (2-3 sentences)
-2. Key Concepts (bullet points)
-3. Important Formulas/Algorithms
-4. Practical Applications
-5. Common Pitfalls
-
-**Content to summarize:**
-
-{content}"""
+        return _CHAPTER_PREFIX.format(chapter=chapter_name.replace('_', ' ').title()) + content.text
 
     except Exception as e:
-        logger.error(f"Error preparing chapter summary: {str(e)}")
+        logger.error("Error preparing chapter summary: %s", e)
         return f"Error: Failed to prepare chapter summary: {str(e)}"
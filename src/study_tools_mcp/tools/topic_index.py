@@ -0,0 +1,125 @@
+"""Inverted index from words to the study materials that contain them."""
+
+import os
+import pickle
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional
+
+from ..utils.logger import get_logger
+from ..parsers.md_parser import extract_text_from_md
+from ..parsers.pdf_parser import extract_text_from_pdf
+
+logger = get_logger(__name__)
+
+INDEX_FILE = Path("./data/.index.pkl")
+
+_TOKEN_RE = re.compile(r'\b\w{3,}\b')
+
+
+def tokenize(text: str) -> frozenset[str]:
+    """Lowercased words of 3+ characters"""
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+
+def file_tokens(path: Path) -> frozenset[str]:
+    """Tokens of a PDF or Markdown file
+
+    Runs in a worker process, so it must stay a top-level function.
+    """
+    if path.suffix == ".pdf":
+        return tokenize(extract_text_from_pdf(path))
+    return tokenize(extract_text_from_md(path))
+
+
+class TopicIndex:
+    """Token -> file postings, persisted and refreshed per file by mtime and size"""
+
+    def __init__(self, index_file: Path = INDEX_FILE):
+        self.index_file = index_file
+        # resolved path -> (mtime_ns, size, tokens)
+        self._files: dict[str, tuple[int, int, frozenset[str]]] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.index_file, "rb") as file:
+                self._files = pickle.load(file)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning("Ignoring unreadable topic index: %s", e)
+            return
+        self._rebuild_postings()
+
+    def _save(self) -> None:
+        tmp_file = self.index_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.index_file.parent.mkdir(exist_ok=True, parents=True)
+            with open(tmp_file, "wb") as file:
+                pickle.dump(self._files, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, self.index_file)
+        except Exception as e:
+            logger.warning("Could not save topic index: %s", e)
+            tmp_file.unlink(missing_ok=True)
+
+    def _rebuild_postings(self) -> None:
+        postings = defaultdict(set)
+        for path, (_, _, tokens) in self._files.items():
+            for token in tokens:
+                postings[token].add(path)
+        self._postings = dict(postings)
+
+    def stale(self, files: list[Path]) -> list[Path]:
+        """Files that are new or changed since they were indexed"""
+        stale = []
+        for file in files:
+            st = file.stat()
+            entry = self._files.get(str(file.resolve()))
+            if entry is None or entry[:2] != (st.st_mtime_ns, st.st_size):
+                stale.append(file)
+        return stale
+
+    def update(self, files: list[Path], tokens: dict[Path, frozenset[str]]) -> None:
+        """Store fresh tokens and drop files no longer in the notes directory"""
+        live = {str(file.resolve()) for file in files}
+        changed = bool(tokens)
+
+        for path in list(self._files):
+            if path not in live:
+                del self._files[path]
+                changed = True
+
+        for file, file_tokens in tokens.items():
+            st = file.stat()
+            self._files[str(file.resolve())] = (st.st_mtime_ns, st.st_size, file_tokens)
+
+        if changed:
+            self._rebuild_postings()
+            self._save()
+            logger.info("Topic index updated: %s file(s), %s tokens", len(self._files), len(self._postings))
+
+    def _containing(self, part: str) -> set[str]:
+        """Files with a word containing part, such as sorting for sort"""
+        files = set()
+        for token, paths in self._postings.items():
+            if part in token:
+                files |= paths
+        return files
+
+    def lookup(self, topic: str) -> Optional[set[str]]:
+        """Resolved paths of files mentioning the topic, or None to search everything
+
+        Files containing every topic word are preferred; if none do, files
+        containing any of them are returned. Words match inside longer
+        words, as the case-insensitive substring section search does, so
+        every file whose text contains the topic is kept.
+        """
+        topic_tokens = tokenize(topic)
+        if not topic_tokens:
+            return None
+
+        postings = [self._containing(token) for token in topic_tokens]
+        return set.intersection(*postings) or set.union(*postings) or None
@@ -3,9 +3,58 @@ Logging Configuration for Study Tools MCP
 """
 
 import logging
+import os
 import sys
 from pathlib import Path
 
+# Handlers are built once per process and shared by every module's logger
+_CONFIGURED = False
+_HANDLERS: list[logging.Handler] = []
+
+
+def _configure() -> None:
+    """Create the shared console and file handlers"""
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+    _CONFIGURED = True
+
+    log_level = logging.INFO
+
+    # Console handler - use stderr for MCP compatibility. Warnings and up
+    # only, so routine INFO records are never formatted for stderr.
+    console_handler = logging.StreamHandler(sys.stderr)
+    console_handler.setLevel(logging.WARNING)
+    console_formatter = logging.Formatter(
+        '%(levelname)s | %(name)s | %(message)s'
+    )
+    console_handler.setFormatter(console_formatter)
+    _HANDLERS.append(console_handler)
+
+    # File handler - set STUDY_TOOLS_LOG_FILE=0 to skip it
+    if os.environ.get("STUDY_TOOLS_LOG_FILE", "1") != "1":
+        return
+
+    try:
+        # Create logs directory
+        log_dir = Path("logs")
+        log_dir.mkdir(exist_ok=True)
+        log_file = log_dir / "study_tools_mcp.log"
+
+        # Plain append mode: the app, the MCP server and its pool workers all
+        # write this file, and per-process rotation would rename it under
+        # the others. delay=True: opened only when the first record is written.
+        file_handler = logging.FileHandler(log_file, encoding='utf-8', delay=True)
+        file_handler.setLevel(log_level)
+        file_formatter = logging.Formatter(
+            '%(asctime)s | %(name)s | %(levelname)s | %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        )
+        file_handler.setFormatter(file_formatter)
+        _HANDLERS.append(file_handler)
+    except Exception as e:
+        print(f"Warning: Could not create file handler: {e}", file=sys.stderr)
+
 
 def get_logger(name: str) -> logging.Logger:
     """
@@ -26,35 +75,13 @@ def get_logger(name: str) -> logging.Logger:
 
     # Only configure if not already configured
     if not logger.handlers:
-        # Set log level
-        log_level = logging.INFO
-        logger.setLevel(log_level)
-
-        # Console handler - use stderr for MCP compatibility
-        console_handler = logging.StreamHandler(sys.stderr)
-        console_handler.setLevel(log_level)
-        console_formatter = logging.Formatter(
-            '%(levelname)s | %(name)s | %(message)s'
-        )
-        console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
-
-        # File handler
-        try:
-            # Create logs directory
-            log_dir = Path("logs")
-            log_dir.mkdir(exist_ok=True)
-            log_file = log_dir / "study_tools_mcp.log"
-
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setLevel(log_level)
-            file_formatter = logging.Formatter(
-                '%(asctime)s | %(name)s | %(levelname)s | %(message)s',
-                datefmt='%Y-%m-%d %H:%M:%S'
-            )
-            file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
-        except Exception as e:
-            print(f"Warning: Could not create file handler: {e}")
+        _configure()
+        # Records below every handler's level are dropped before they are built
+        logger.setLevel(min(handler.level for handler in _HANDLERS))
+        # Our handlers are enough; FastMCP installs an INFO handler on root
+        # that would otherwise format every record to stderr again
+        logger.propagate = False
+        for handler in _HANDLERS:
+            logger.addHandler(handler)
 
     return logger
@@ -0,0 +1,167 @@
+"""
+Bounded conversation memory for chat sessions.
+
+Keeps the most recent turns verbatim and collapses older turns into a
+single running summary, so the prompt sent to OpenAI stays roughly
+constant in size no matter how long a conversation runs.
+"""
+
+from collections import deque
+from dataclasses import dataclass, field
+
+import tiktoken
+
+from ..config import settings
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+# Working-memory limits
+MAX_TURNS = 20
+TOKEN_BUDGET = 4000
+SUMMARY_MODEL = "gpt-4o-mini"
+
+# Tool results (study material excerpts) kept from turns already answered;
+# the assistant's reply holds what was made from them
+OLD_TOOL_RESULT_CHARS = 500
+
+SUMMARY_PROMPT = (
+    "Summarize the prior context of this conversation between a student and a "
+    "study assistant. Keep topics covered, facts the student asked about, quiz "
+    "or flashcard results, and any preferences they expressed. Be concise."
+)
+
+# encode_ordinary treats special-token text such as <|endoftext|> as plain
+# text; encode() would raise on it
+try:
+    _encode = tiktoken.encoding_for_model(settings.DEFAULT_MODEL).encode_ordinary
+except KeyError:
+    _encode = tiktoken.get_encoding("o200k_base").encode_ordinary
+
+
+def count_tokens(message: dict) -> int:
+    """Approximate the prompt tokens used by a chat message"""
+    tokens = len(_encode(message.get("content") or ""))
+    for tool_call in message.get("tool_calls") or []:
+        tokens += len(_encode(tool_call["function"]["arguments"]))
+    return tokens
+
+
+@dataclass
+class ConversationMemory:
+    """Rolling window of recent turns plus a summary of everything older.
+
+    A turn is a user message followed by every assistant/tool message it
+    produced, so tool calls are never separated from their results.
+    """
+
+    summary: str = ""
+    recent: deque = field(default_factory=deque)
+    tokens: int = 0
+
+    def to_dict(self) -> dict:
+        """Plain-data form for serializing to a session store"""
+        return {
+            "summary": self.summary,
+            "recent": [list(turn) for turn in self.recent],
+            "tokens": self.tokens
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ConversationMemory":
+        """Rebuild a memory from to_dict() output"""
+        return cls(
+            summary=data["summary"],
+            recent=deque(data["recent"]),
+            tokens=data["tokens"]
+        )
+
+    def append(self, message: dict) -> None:
+        """Add a message, starting a new turn on every user message"""
+        tokens = count_tokens(message)
+        if message["role"] == "user" or not self.recent:
+            if self.recent:
+                self._trim_tool_results(self.recent[-1])
+            self.recent.append([])
+        self.recent[-1].append(message)
+        self.tokens += tokens
+
+    def _trim_tool_results(self, turn: list[dict]) -> None:
+        """Shorten the tool results of an answered turn"""
+        for i, message in enumerate(turn):
+            content = message.get("content") or ""
+            if message["role"] != "tool" or len(content) <= OLD_TOOL_RESULT_CHARS:
+                continue
+            trimmed = {**message, "content": content[:OLD_TOOL_RESULT_CHARS] + "\n[trimmed]"}
+            self.tokens += count_tokens(trimmed) - count_tokens(message)
+            turn[i] = trimmed
+
+    def messages(self) -> list[dict]:
+        """Messages to send to OpenAI: summary first, then recent turns"""
+        messages = []
+        if self.summary:
+            messages.append({
+                "role": "system",
+                "content": f"Prior conversation summary: {self.summary}"
+            })
+        for turn in self.recent:
+            messages.extend(turn)
+        return messages
+
+    def needs_compaction(self) -> bool:
+        """Whether the window is over its turn or token budget"""
+        return len(self.recent) > 1 and (
+            len(self.recent) > MAX_TURNS or self.tokens > TOKEN_BUDGET
+        )
+
+    def pop_oldest_turns(self) -> list[list[dict]]:
+        """Remove old turns until back under budget, keeping the latest turn"""
+        popped = []
+        while len(self.recent) > 1 and (
+            len(self.recent) > MAX_TURNS // 2 or self.tokens > TOKEN_BUDGET // 2
+        ):
+            turn = self.recent.popleft()
+            self.tokens -= sum(count_tokens(message) for message in turn)
+            popped.append(turn)
+        return popped
+
+    def restore_turns(self, turns: list[list[dict]]) -> None:
+        """Put turns from pop_oldest_turns() back in front of the window"""
+        for turn in reversed(turns):
+            self.recent.appendleft(turn)
+            self.tokens += sum(count_tokens(message) for message in turn)
+
+
+async def compact(memory: ConversationMemory, openai_client) -> None:
+    """Fold the oldest turns into the running summary if over budget"""
+    if not memory.needs_compaction():
+        return
+
+    old_turns = memory.pop_oldest_turns()
+    transcript = "\n".join(
+        f"{message['role']}: {message['content']}"
+        for turn in old_turns
+        for message in turn
+        if message.get("content")
+    )
+    if memory.summary:
+        transcript = f"Earlier summary: {memory.summary}\n\n{transcript}"
+
+    try:
+        response = await openai_client.chat.completions.create(
+            model=SUMMARY_MODEL,
+            messages=[
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {"role": "user", "content": transcript}
+            ]
+        )
+        summary = response.choices[0].message.content
+    except Exception as e:
+        logger.error("Failed to summarize conversation history: %s", e)
+        summary = None
+
+    if summary:
+        memory.summary = summary
+    else:
+        # Keep the turns verbatim rather than lose them; the next message retries
+        memory.restore_turns(old_turns)
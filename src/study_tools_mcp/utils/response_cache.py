@@ -0,0 +1,127 @@
+"""
+Two-tier response cache for chat messages.
+
+Tier 1 is an exact match on the message text. Tier 2 compares message
+embeddings and returns the cached response of the nearest previous
+message when their cosine similarity is above a threshold.
+
+Both tiers only match messages sent after the same conversation history
+and against the same study materials, so a follow-up like "tell me more"
+is never answered from another session, and answers built from old or
+missing notes expire when the notes change.
+"""
+
+import hashlib
+from typing import Optional
+
+import numpy as np
+import orjson
+from cachetools import LRUCache
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+
+
+def context_digest(messages: list[dict], notes: list = ()) -> str:
+    """Digest of the conversation a message is sent after and the notes it can use"""
+    return hashlib.sha1(orjson.dumps([notes, messages])).hexdigest()
+
+
+class ResponseCache:
+    """Exact + semantic cache in front of the OpenAI chat calls"""
+
+    def __init__(
+        self,
+        openai_client,
+        scope: str = "",
+        maxsize: int = 1024,
+        threshold: float = 0.95
+    ):
+        self.openai_client = openai_client
+        self.scope = scope
+        self.threshold = threshold
+
+        # Tier 1: sha1(scope + context + message) -> response
+        self._exact: LRUCache = LRUCache(maxsize=maxsize)
+
+        # Tier 2: ring buffer of unit-length embeddings, their responses and contexts
+        self._matrix = np.zeros((maxsize, EMBEDDING_DIM), dtype=np.float32)
+        self._responses: list[Optional[str]] = [None] * maxsize
+        self._contexts: list[Optional[str]] = [None] * maxsize
+        self._size = 0
+        self._next = 0
+
+    def _key(self, message: str, context: str) -> str:
+        return hashlib.sha1(
+            f"{self.scope}\x00{context}\x00{message.strip()}".encode("utf-8")
+        ).hexdigest()
+
+    async def _embed(self, message: str) -> Optional[np.ndarray]:
+        try:
+            response = await self.openai_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=message
+            )
+        except Exception as e:
+            logger.warning("Embedding request failed: %s", e)
+            return None
+
+        embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm else None
+
+    async def lookup(
+        self,
+        message: str,
+        context: str = ""
+    ) -> tuple[Optional[str], Optional[np.ndarray]]:
+        """Return (cached response or None, message embedding for store())
+
+        context is the context_digest() of the history the message follows.
+        """
+        cached = self._exact.get(self._key(message, context))
+        if cached is not None:
+            logger.info("Response cache hit (exact)")
+            return cached, None
+
+        embedding = await self._embed(message)
+        if embedding is None or not self._size:
+            return None, embedding
+
+        scores = self._matrix[:self._size] @ embedding
+        same_context = np.fromiter(
+            (entry == context for entry in self._contexts[:self._size]),
+            dtype=bool,
+            count=self._size
+        )
+        scores[~same_context] = -np.inf
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            logger.info("Response cache hit (semantic, similarity %.3f)", scores[best])
+            return self._responses[best], embedding
+
+        return None, embedding
+
+    def store(
+        self,
+        message: str,
+        response: str,
+        embedding: Optional[np.ndarray],
+        context: str = ""
+    ) -> None:
+        """Add a response to both tiers"""
+        if not response:
+            return
+
+        self._exact[self._key(message, context)] = response
+
+        if embedding is not None:
+            self._matrix[self._next] = embedding
+            self._responses[self._next] = response
+            self._contexts[self._next] = context
+            self._next = (self._next + 1) % len(self._responses)
+            self._size = min(self._size + 1, len(self._responses))
@@ -0,0 +1,29 @@
+"""
+Helpers for exposing MCP tool schemas to OpenAI function calling.
+"""
+
+import orjson
+
+
+def clean_schema(schema: dict) -> dict:
+    """Return a copy of a tool input schema with 'title' fields removed"""
+    schema = orjson.loads(orjson.dumps(schema))
+
+    # Iterative walk over schema nodes only; keys of "properties" are
+    # field names, so a field called "title" is left alone
+    stack = [schema]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, dict):
+            continue
+
+        node.pop("title", None)
+
+        properties = node.get("properties")
+        if isinstance(properties, dict):
+            stack.extend(properties.values())
+
+        if "items" in node:
+            stack.append(node["items"])
+
+    return schema
@@ -0,0 +1,105 @@
+"""
+Conversation session storage.
+
+The in-memory store keeps sessions in the current process. The Redis
+store shares them between uvicorn workers and survives restarts.
+"""
+
+from abc import ABC, abstractmethod
+
+from cachetools import TTLCache
+
+from ..config import settings
+from .logger import get_logger
+from .memory import ConversationMemory
+
+try:
+    import msgpack
+    import redis.asyncio as redis
+except ImportError:
+    msgpack = None
+    redis = None
+
+logger = get_logger(__name__)
+
+
+class SessionStore(ABC):
+    """Load, save and clear the conversation memory of a session"""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> ConversationMemory:
+        """Memory of a session, or an empty memory for a new one"""
+
+    @abstractmethod
+    async def save(self, session_id: str, memory: ConversationMemory) -> None:
+        """Store the memory of a session"""
+
+    @abstractmethod
+    async def clear(self, session_id: str) -> None:
+        """Forget a session"""
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemorySessionStore(SessionStore):
+    """Sessions in a process-local LRU, evicted after ttl seconds idle"""
+
+    def __init__(self, maxsize: int, ttl: int):
+        self._sessions: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, session_id: str) -> ConversationMemory:
+        memory = self._sessions.get(session_id) or ConversationMemory()
+        # Re-inserting refreshes the TTL
+        self._sessions[session_id] = memory
+        return memory
+
+    async def save(self, session_id: str, memory: ConversationMemory) -> None:
+        self._sessions[session_id] = memory
+
+    async def clear(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+
+class RedisSessionStore(SessionStore):
+    """Sessions as msgpack blobs under sess:{session_id} with an expiry"""
+
+    def __init__(self, url: str, ttl: int):
+        if redis is None or msgpack is None:
+            raise ImportError(
+                "REDIS_URL is set but redis/msgpack are not installed. "
+                "Install them with: pip install redis msgpack"
+            )
+        self._redis = redis.Redis.from_url(url)
+        self._ttl = ttl
+
+    @staticmethod
+    def _key(session_id: str) -> str:
+        return f"sess:{session_id}"
+
+    async def get(self, session_id: str) -> ConversationMemory:
+        data = await self._redis.get(self._key(session_id))
+        if not data:
+            return ConversationMemory()
+        return ConversationMemory.from_dict(msgpack.unpackb(data))
+
+    async def save(self, session_id: str, memory: ConversationMemory) -> None:
+        await self._redis.set(
+            self._key(session_id),
+            msgpack.packb(memory.to_dict()),
+            ex=self._ttl
+        )
+
+    async def clear(self, session_id: str) -> None:
+        await self._redis.delete(self._key(session_id))
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+def create_session_store() -> SessionStore:
+    """Use Redis when REDIS_URL is configured, otherwise keep sessions in memory"""
+    if settings.REDIS_URL:
+        logger.info("Using Redis session store")
+        return RedisSessionStore(settings.REDIS_URL, settings.SESSION_TTL)
+    return InMemorySessionStore(settings.MAX_SESSIONS, settings.SESSION_TTL)
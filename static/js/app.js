@@ -72,6 +72,7 @@ async function sendMessage() {
     const reader = response.body.getReader();
     const decoder = new TextDecoder();
     let assistantMessage = "";
+    let buffer = "";
 
     // Create assistant message container
     const messageDiv = addMessage("", "assistant");
@@ -80,18 +81,21 @@ async function sendMessage() {
       const { done, value } = await reader.read();
       if (done) break;
 
-      const chunk = decoder.decode(value);
-      const lines = chunk.split("\n");
+      // Events can be split across reads; keep the incomplete tail for next time
+      buffer += decoder.decode(value, { stream: true });
+      const events = buffer.split("\n\n");
+      buffer = events.pop();
 
-      for (const line of lines) {
-        if (line.startsWith("data: ")) {
-          const data = line.slice(6).trim();
+      for (const event of events) {
+        if (event.startsWith("data: ")) {
+          const data = event.slice(6);
 
           if (data === "[DONE]") {
             break;
           }
 
-          assistantMessage += data + "\n";
+          // Each event is a JSON-encoded text delta
+          assistantMessage += JSON.parse(data);
           // During streaming: show plain text only (no flashcard/quiz rendering yet)
           messageDiv.innerHTML = formatMessage(assistantMessage, true);
 